@@ -1,12 +1,72 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
+import bisect
 import json
 import os
 import time
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from openpyxl import Workbook
 
-DATA_FILE = "time_records.json"
+try:
+    import orjson  # much faster JSON encode/decode, if installed
+except ImportError:
+    orjson = None
+
+DATA_FILE = "time_records.jsonl"  # one JSON record per line (NDJSON)
+LEGACY_DATA_FILE = "time_records.json"  # old single-array format, migrated on load
+
+
+def dump_record_line(record):
+    """Serialize one record to a single NDJSON line (as UTF-8 bytes)."""
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    # Compact, unescaped UTF-8 -- the same output orjson produces
+    line = json.dumps(record, separators=(",", ":"), ensure_ascii=False)
+    return (line + "\n").encode("utf-8")
+
+
+def load_json(data):
+    """Parse JSON from bytes, using orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def drop_partial_line(path):
+    """
+    Make sure the file ends with a line break before appending to it.
+    An interrupted append can leave an incomplete last line behind; it is
+    dropped (or just terminated, if it is in fact a complete record).
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+
+        # Find where the unterminated last line starts
+        pos = size
+        line_start = 0
+        while pos > 0:
+            step = min(4096, pos)
+            pos -= step
+            f.seek(pos)
+            newline = f.read(step).rfind(b"\n")
+            if newline != -1:
+                line_start = pos + newline + 1
+                break
+
+        f.seek(line_start)
+        try:
+            load_json(f.read())
+        except ValueError:
+            f.truncate(line_start)
+        else:
+            f.write(b"\n")
 
 
 class TimeTrackerApp:
@@ -18,9 +78,18 @@ class TimeTrackerApp:
         #    INTERNAL TIMER STATES
         # -----------------------------
         self.timer_running = False
-        self.start_time = None  # raw time.time() when session starts/resumes
+        self.start_time = None  # raw time.monotonic() when session starts/resumes
         self.start_time_dt = None  # actual datetime when user pressed "Start"
         self.elapsed_time = 0.0  # accumulates total seconds across pause/resume
+        self._last_shown_seconds = None  # whole seconds currently on the label
+        self._after_id = None  # pending update_timer callback (only while running)
+
+        # -----------------------------
+        #        RECORDS CACHE
+        # -----------------------------
+        self._records_cache = None  # records as last read from / written to disk
+        self._records_mtime = None  # DATA_FILE mtime matching the cache
+        self._records_index = None  # (records sorted by start_time, their start_times)
 
         # -----------------------------
         #         UI ELEMENTS
@@ -67,9 +136,6 @@ class TimeTrackerApp:
         )
         self.export_button.pack(side=tk.LEFT, padx=5)
 
-        # Continuously update the displayed timer
-        self.update_timer()
-
     # -------------------------------------------------
     #                   TIMER LOGIC
     # -------------------------------------------------
@@ -81,10 +147,11 @@ class TimeTrackerApp:
 
         # Actual datetime for the start
         self.start_time_dt = datetime.now()
-        # Store the raw time.time()
-        self.start_time = time.time()
+        # Store the raw time.monotonic() (unaffected by wall-clock changes)
+        self.start_time = time.monotonic()
         self.timer_running = True
         self.elapsed_time = 0.0  # reset to 0 at the start of a new session
+        self.update_timer()
 
     def pause_timer(self):
         """Pause the timer (accumulate elapsed time)."""
@@ -93,8 +160,10 @@ class TimeTrackerApp:
             return
 
         # Accumulate elapsed
-        self.elapsed_time += time.time() - self.start_time
+        self.elapsed_time += time.monotonic() - self.start_time
         self.timer_running = False
+        self.cancel_timer_updates()
+        self.update_timer_label(self.elapsed_time)
 
     def resume_timer(self):
         """Resume the timer from a paused state."""
@@ -102,8 +171,9 @@ class TimeTrackerApp:
             messagebox.showwarning("Warning", "Timer is already running!")
             return
 
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         self.timer_running = True
+        self.update_timer()
 
     def stop_timer(self):
         """Stop the timer, prompt for a comment, save record, and reset."""
@@ -113,8 +183,9 @@ class TimeTrackerApp:
 
         if self.timer_running:
             # finalize the time accumulation
-            self.elapsed_time += time.time() - self.start_time
+            self.elapsed_time += time.monotonic() - self.start_time
             self.timer_running = False
+            self.cancel_timer_updates()
 
         # Prompt user for a comment
         comment = simpledialog.askstring(
@@ -143,48 +214,160 @@ class TimeTrackerApp:
         messagebox.showinfo("Session Recorded", "Your work session has been saved.")
 
     def update_timer(self):
-        """Continuously update the on-screen timer display."""
-        if self.timer_running:
-            current_elapsed = self.elapsed_time + (time.time() - self.start_time)
-        else:
-            current_elapsed = self.elapsed_time
+        """Refresh the on-screen timer display while the timer is running."""
+        self._after_id = None
+        if not self.timer_running:
+            return
+
+        current_elapsed = self.elapsed_time + (time.monotonic() - self.start_time)
 
-        self.update_timer_label(current_elapsed)
-        self.master.after(200, self.update_timer)  # run again in 200ms
+        # The label only shows whole seconds, so skip redundant redraws
+        if int(current_elapsed) != self._last_shown_seconds:
+            self.update_timer_label(current_elapsed)
+
+        # Run again just after the displayed second ticks over
+        delay = int((1 - current_elapsed % 1) * 1000) + 5
+        self._after_id = self.master.after(delay, self.update_timer)
+
+    def cancel_timer_updates(self):
+        """Cancel the pending update_timer callback, if any."""
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
 
     def update_timer_label(self, elapsed_seconds):
         """Convert seconds to H:MM:SS and show on the timer label."""
-        hours = int(elapsed_seconds // 3600)
-        minutes = int((elapsed_seconds % 3600) // 60)
-        seconds = int(elapsed_seconds % 60)
+        total = int(elapsed_seconds)
+        hours, rem = divmod(total, 3600)
+        minutes, seconds = divmod(rem, 60)
         self.timer_label.config(text=f"{hours:02d}:{minutes:02d}:{seconds:02d}")
+        self._last_shown_seconds = total
 
     # -------------------------------------------------
     #                DATA PERSISTENCE
     # -------------------------------------------------
     def load_records(self):
-        """Load time records from JSON."""
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return []
+        """
+        Load time records from the NDJSON file (one record per line).
+        The parsed list is cached and only re-read if the file changed
+        on disk since we last read or wrote it.
+        """
+        if not os.path.exists(DATA_FILE):
+            return self.migrate_legacy_records()
+
+        mtime = os.path.getmtime(DATA_FILE)
+        if self._records_cache is not None and mtime == self._records_mtime:
+            return self._records_cache
+
+        records = []
+        with open(DATA_FILE, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    records.append(load_json(line))
+                except ValueError:
+                    # Only an interrupted append can leave a broken line, and
+                    # that is always the last one (it has no line break)
+                    if line.endswith(b"\n"):
+                        raise
+
+        self._records_cache = records
+        self._records_mtime = mtime
+        self._records_index = None
+        return records
+
+    def migrate_legacy_records(self):
+        """Convert an old JSON-array data file to NDJSON (if one exists)."""
+        if not os.path.exists(LEGACY_DATA_FILE):
+            return []
+        with open(LEGACY_DATA_FILE, "rb") as f:
+            records = load_json(f.read())
+        self.save_records(records)
+        return records
 
     def save_records(self, records):
-        """Save the entire list of records to JSON."""
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump(records, f, indent=4)
+        """
+        Rewrite the entire data file (only needed after an edit or delete).
+        The new content goes to a temp file that then replaces DATA_FILE,
+        so a crash during this rewrite leaves the previous file intact.
+        (Appends from save_time_record can at worst leave a partial last
+        line, which load_records skips.)
+        """
+        tmp_file = DATA_FILE + ".tmp"
+        try:
+            with open(tmp_file, "wb") as f:
+                f.write(b"".join(dump_record_line(rec) for rec in records))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, DATA_FILE)
+        except Exception:
+            # Callers may already have changed the cached list in place;
+            # drop it so the next load re-reads what is actually on disk
+            self._records_cache = None
+            self._records_mtime = None
+            self._records_index = None
+            raise
+
+        self._records_cache = records
+        self._records_mtime = os.path.getmtime(DATA_FILE)
+        self._records_index = None
 
     def save_time_record(self, start_time_dt, end_time_dt, elapsed_seconds, comment):
-        """Append a new record to the JSON file."""
-        records = self.load_records()
+        """Append a single new record to the data file without rewriting it."""
         new_record = {
-            "start_time": start_time_dt.isoformat(),
-            "end_time": end_time_dt.isoformat(),
+            "start_time": start_time_dt.isoformat(timespec="seconds"),
+            "end_time": end_time_dt.isoformat(timespec="seconds"),
             "elapsed": elapsed_seconds,
             "comment": comment,
         }
-        records.append(new_record)
-        self.save_records(records)
+        if not os.path.exists(DATA_FILE):
+            # Carry over any old-format history before the first append
+            self.migrate_legacy_records()
+
+        # The cache can only be extended if nothing else changed the file
+        cache_valid = (
+            self._records_cache is not None
+            and os.path.exists(DATA_FILE)
+            and os.path.getmtime(DATA_FILE) == self._records_mtime
+        )
+
+        drop_partial_line(DATA_FILE)
+        with open(DATA_FILE, "ab") as f:
+            f.write(dump_record_line(new_record))
+            f.flush()
+            os.fsync(f.fileno())
+
+        if not cache_valid:
+            # Re-read lazily on the next load_records()
+            self._records_cache = None
+            self._records_index = None
+            return
+
+        self._records_cache.append(new_record)
+        self._records_mtime = os.path.getmtime(DATA_FILE)
+
+        # New sessions normally come last, so the sorted index can just grow
+        if self._records_index is not None:
+            ordered, keys = self._records_index
+            if not keys or keys[-1] <= new_record["start_time"]:
+                ordered.append(new_record)
+                keys.append(new_record["start_time"])
+            else:
+                self._records_index = None
+
+    def records_by_start(self):
+        """
+        Return (records, start_times), both sorted by start time, so a date
+        range can be located with bisect. Built once per change to the data.
+        """
+        records = self.load_records()
+        if self._records_index is None:
+            # Records are appended chronologically, so this sort is ~linear
+            ordered = sorted(records, key=lambda r: r.get("start_time", ""))
+            keys = [r.get("start_time", "") for r in ordered]
+            self._records_index = (ordered, keys)
+        return self._records_index
 
     # -------------------------------------------------
     #              EDITING & DELETING
@@ -220,14 +403,8 @@ class TimeTrackerApp:
         self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.config(command=self.listbox.yview)
 
-        # Populate the listbox
-        for rec in records:
-            start_str = rec.get("start_time", "N/A")
-            end_str = rec.get("end_time", "N/A")
-            cmt = rec.get("comment", "")
-            self.listbox.insert(
-                tk.END, f"Start: {start_str} | End: {end_str} | Comment: {cmt}"
-            )
+        # Populate the listbox (one insert call for all rows)
+        self.listbox.insert(tk.END, *[self._fmt_row(rec) for rec in records])
 
         # Button frame
         btn_frame = tk.Frame(self.edit_window)
@@ -286,9 +463,9 @@ class TimeTrackerApp:
             new_comment = comment_var.get()
 
             try:
-                dt_start = datetime.strptime(new_start, "%Y-%m-%d %H:%M:%S")
-                dt_end = datetime.strptime(new_end, "%Y-%m-%d %H:%M:%S")
-            except ValueError:
+                dt_start = self.parse_display_datetime(new_start)
+                dt_end = self.parse_display_datetime(new_end)
+            except (ValueError, TypeError):
                 messagebox.showerror(
                     "Error", "Invalid date/time. Use YYYY-MM-DD HH:MM:SS format."
                 )
@@ -301,23 +478,17 @@ class TimeTrackerApp:
             elapsed = (dt_end - dt_start).total_seconds()
 
             # Update the record in memory
-            record["start_time"] = dt_start.isoformat()
-            record["end_time"] = dt_end.isoformat()
+            record["start_time"] = dt_start.isoformat(timespec="seconds")
+            record["end_time"] = dt_end.isoformat(timespec="seconds")
             record["elapsed"] = elapsed
             record["comment"] = new_comment
 
             # Save to disk
             self.save_records(self.edit_window_records)
 
-            # Refresh listbox
-            self.listbox.delete(0, tk.END)
-            for r in self.edit_window_records:
-                s_str = r.get("start_time", "N/A")
-                e_str = r.get("end_time", "N/A")
-                cmt = r.get("comment", "")
-                self.listbox.insert(
-                    tk.END, f"Start: {s_str} | End: {e_str} | Comment: {cmt}"
-                )
+            # Refresh just the edited row
+            self.listbox.delete(index)
+            self.listbox.insert(index, self._fmt_row(record))
 
             messagebox.showinfo("Success", "Record updated.")
             edit_dialog.destroy()
@@ -338,18 +509,40 @@ class TimeTrackerApp:
             del self.edit_window_records[index]
             self.save_records(self.edit_window_records)
 
-            # Refresh listbox
-            self.listbox.delete(0, tk.END)
-            for r in self.edit_window_records:
-                s_str = r.get("start_time", "N/A")
-                e_str = r.get("end_time", "N/A")
-                cmt = r.get("comment", "")
-                self.listbox.insert(
-                    tk.END, f"Start: {s_str} | End: {e_str} | Comment: {cmt}"
-                )
+            # Remove just the deleted row
+            self.listbox.delete(index)
 
             messagebox.showinfo("Deleted", "Record deleted successfully.")
 
+    @staticmethod
+    def _row_view(rec):
+        """Unpack a record into (start_time, end_time, elapsed, comment)."""
+        return (
+            rec.get("start_time", ""),
+            rec.get("end_time", ""),
+            rec.get("elapsed", 0),
+            rec.get("comment", ""),
+        )
+
+    @classmethod
+    def _fmt_row(cls, rec):
+        """Format a record as a single line for the edit listbox."""
+        start_str, end_str, _, cmt = cls._row_view(rec)
+        return f"Start: {start_str or 'N/A'} | End: {end_str or 'N/A'} | Comment: {cmt}"
+
+    @staticmethod
+    def parse_display_datetime(text):
+        """
+        Parse a 'YYYY-MM-DD HH:MM:SS' string into a naive datetime.
+        fromisoformat alone would also take date-only or timezone-aware
+        input, which we reject so stored start times stay comparable.
+        """
+        text = text.strip()
+        dt = datetime.fromisoformat(text)
+        if len(text) != 19 or dt.tzinfo is not None:
+            raise ValueError(f"Not a YYYY-MM-DD HH:MM:SS date/time: {text!r}")
+        return dt
+
     @staticmethod
     def iso_to_display(iso_str):
         """Convert ISO datetime (e.g. 2025-01-05T14:30:00) to 'YYYY-MM-DD HH:MM:SS'."""
@@ -395,48 +588,41 @@ class TimeTrackerApp:
 
     def export_data_to_excel(self, start_date_str, end_date_str, filepath):
         """Export records in [start_date, end_date] to an Excel file, plus a sum row."""
-        records = self.load_records()
-
         try:
-            start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-            end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
+            start_date = date.fromisoformat(start_date_str.strip())
+            end_date = date.fromisoformat(end_date_str.strip())
         except ValueError:
             raise ValueError("Dates must be in YYYY-MM-DD format.")
 
-        filtered = []
-        for r in records:
-            try:
-                dt_start = datetime.fromisoformat(r["start_time"]).date()
-            except (ValueError, KeyError):
-                continue
-            if start_date <= dt_start <= end_date:
-                filtered.append(r)
+        # ISO 8601 strings sort chronologically, so the date range can be
+        # found by binary search over the sorted start times.
+        start_key = start_date.isoformat()
+        end_key_plus = (end_date + timedelta(days=1)).isoformat()
+        records, keys = self.records_by_start()
+        lo = bisect.bisect_left(keys, start_key)
+        hi = bisect.bisect_left(keys, end_key_plus, lo)
 
-        if not filtered:
+        if lo == hi:
             raise ValueError("No records found in the specified date range.")
 
-        # Create the workbook and sheet
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "WorkHours"
+        # Create a write-only workbook: rows are streamed out on save
+        # instead of being kept as full Cell objects in memory
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("WorkHours")
 
         # Header row
         headers = ["Start Time", "End Time", "Elapsed (seconds)", "Comment"]
         ws.append(headers)
 
-        # Populate rows
-        for rec in filtered:
-            ws.append(
-                [
-                    rec.get("start_time", ""),
-                    rec.get("end_time", ""),
-                    rec.get("elapsed", ""),
-                    rec.get("comment", ""),
-                ]
-            )
+        # Stream the matching rows straight into the sheet, summing the
+        # elapsed time in the same pass (no intermediate list)
+        total_seconds = 0
+        for i in range(lo, hi):
+            row = self._row_view(records[i])
+            ws.append(row)
+            total_seconds += row[2]
 
         # --- Summation row(s) ---
-        total_seconds = sum(rec["elapsed"] for rec in filtered)
         total_hours = total_seconds / 3600
 
         # Let's add a blank row first